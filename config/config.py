@@ -1,10 +1,49 @@
 import logging
 import json
-from typing import Dict, Union, List
+import mmap
+import os
+from typing import Any, Dict, Union, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
 
+_REQUIRED_FIELDS = frozenset(("extension_to_folder", "folder_paths", "keep_duplicates", "status_level"))
+
+
+def _loads(data: Union[bytes, memoryview]) -> Any:
+    """
+    Deserializes JSON data, using `orjson` when it is available.
+
+    :param data: The raw JSON document.
+    :type data: Union[bytes, memoryview]
+
+    :returns: The deserialized object.
+    :rtype: Any
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def _dumps(data: Any) -> bytes:
+    """
+    Serializes data to indented JSON, using `orjson` when it is available.
+
+    :param data: The object to serialize.
+    :type data: Any
+
+    :returns: The UTF-8 encoded JSON document.
+    :rtype: bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode()
+
 
 class Config:
     """
@@ -33,27 +72,30 @@ class Config:
 
         :raises FileNotFoundError: If the configuration file does not exist.
         :raises KeyError: If any required fields are missing from the configuration file.
-        :raises ValueError: If any validation errors occur (e.g., empty folder paths or too many folders).
+        :raises ValueError: If the configuration file is empty or any validation errors occur (e.g., empty folder paths or too many folders).
         """
         try:
-            with open(self.config_file) as config:
-                config_data = json.load(config)
-
-            required_fields = {"extension_to_folder", "folder_paths", "keep_duplicates", "status_level"}
-
-            missing_fields = required_fields - config_data.keys()
+            with open(self.config_file, "rb") as config:
+                # An empty file cannot be memory-mapped, and would not be a valid config anyway
+                if not os.fstat(config.fileno()).st_size:
+                    raise ValueError(f"Configuration file '{self.config_file}' is empty")
+                with mmap.mmap(config.fileno(), 0, access=mmap.ACCESS_READ) as buffer, memoryview(buffer) as view:
+                    config_data = _loads(view)
+
+            missing_fields = _REQUIRED_FIELDS.difference(config_data)
             if missing_fields:
-                raise KeyError(f"Missing '{missing_fields}' in '{self.config_file}'")
+                raise KeyError(f"Missing '{set(missing_fields)}' in '{self.config_file}'")
 
-            if not len(config_data["folder_paths"]):
+            folders_count = len(config_data["folder_paths"])
+            if not folders_count:
                 raise ValueError(f"'folder_paths' in {self.config_file} cannot be empty")
-            elif len(config_data["folder_paths"]) > 20:
+            elif folders_count > 20:
                 raise ValueError(f"'folder_paths' in {self.config_file} is too large. It should be less than 20")
 
             return config_data
 
         except FileNotFoundError:
-            logger.error(f"Configuration file '{self.config_file}' not found.")
+            logger.error("Configuration file '%s' not found.", self.config_file)
             raise
         except (KeyError, ValueError) as e:
             logger.error(e)
@@ -62,10 +104,11 @@ class Config:
     def set_configs(
             self,
             *,
-            extension_to_folder: List[str] = None,
+            extension_to_folder: Dict[str, str] = None,
             folder_paths: List[str] = None,
             keep_duplicates: str = None,
-            status_level: str = None
+            status_level: str = None,
+            write: bool = True
     ) -> None:
         """
         Updates the configuration file with new values.
@@ -73,20 +116,22 @@ class Config:
         This method allows you to update specific configurations in the JSON file, such as adding
         new extensions and folders, changing the duplicate file behavior, or updating the status level.
 
-        :param extension_to_folder: A list of extension-folder mappings to update.
-        :type extension_to_folder: list, optional
+        :param extension_to_folder: A mapping of extensions (starting with '.') to the folders to update.
+        :type extension_to_folder: dict, optional
         :param folder_paths: A list of folder paths to update.
         :type folder_paths: list, optional
         :param keep_duplicates: A string indicating whether to keep duplicates ("true" or "false").
         :type keep_duplicates: str, optional
         :param status_level: The level of status to display ("all", "success", or "failed").
         :type status_level: str, optional
+        :param write: If False, only the loaded configs are updated and the file is left untouched, so that several updates can be written at once by a later call. Defaults to True.
+        :type write: bool, optional
 
         :raises TypeError: If any argument is not of the expected type.
-        :raises FileNotFoundError: If the configuration file does not exist.
+        :raises FileNotFoundError: If the directory of the configuration file does not exist.
         """
         if not (
-            (isinstance(extension_to_folder, list) or extension_to_folder is None) and
+            (isinstance(extension_to_folder, dict) or extension_to_folder is None) and
             (isinstance(folder_paths, list) or folder_paths is None) and
             (isinstance(keep_duplicates, str) or keep_duplicates is None) and
             (isinstance(status_level, str) or status_level is None)
@@ -94,15 +139,15 @@ class Config:
             raise TypeError("Invalid argument types provided")
 
         try:
-            with open(self.config_file) as config:
-                config_data = json.load(config)
+            # Work on a copy of the loaded configs so a failed write leaves them untouched
+            config_data = dict(self.configs)
+            config_data["extension_to_folder"] = dict(config_data["extension_to_folder"])
 
             if extension_to_folder is not None:
-                for data in extension_to_folder:
-                    if data := data.strip():
-                        data_parts = data.split(" ", 1)
-                        if len(data_parts) == 2 and data_parts[0].startswith("."):
-                            config_data["extension_to_folder"].update({data_parts[0]: data_parts[1].strip()})
+                extension_map = config_data["extension_to_folder"]
+                for extension, folder in extension_to_folder.items():
+                    if extension.startswith(".") and folder:
+                        extension_map[extension] = folder
 
             if (folder_paths is not None) and (0 < len(folder_paths) < 20):
                 config_data["folder_paths"] = folder_paths
@@ -113,13 +158,29 @@ class Config:
             if (status_level is not None) and (status_level in ("all", "success", "failed")):
                 config_data["status_level"] = status_level.lower()
 
-            self.configs = config_data
+            if not write:
+                self.configs = config_data
+                return
+
+            # Write to a temporary file first so a failed write never leaves a truncated config behind
+            temp_file = self.config_file + ".tmp"
+            try:
+                with open(temp_file, "wb") as config:
+                    config.write(_dumps(config_data))
+                    config.flush()
+                    os.fsync(config.fileno())
+                os.replace(temp_file, self.config_file)
+            except BaseException:
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+                raise
 
-            with open(self.config_file, "w") as config:
-                json.dump(config_data, config, indent=4)
+            self.configs = config_data
 
         except FileNotFoundError as e:
-            logger.error(f"Configuration file '{self.config_file}' not found.")
+            logger.error("Configuration file '%s' not found.", self.config_file)
             raise
         except TypeError as e:
             logger.error(e)
@@ -152,5 +213,5 @@ class Config:
         if file.endswith(".json"):
             self._config_file = file
         else:
-            logger.error(f"Config file '{file}' should be a JSON file")
+            logger.error("Config file '%s' should be a JSON file", file)
             raise ValueError(f"Invalid file type: {file}. Only '.json' files are allowed")
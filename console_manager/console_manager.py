@@ -4,23 +4,46 @@ import sys
 import os
 
 
-colorama.init()
 logger = logging.getLogger(__name__)
 
+# ANSI sequences are only emitted to a terminal; redirected output gets plain text flags instead
+_ANSI = sys.stdout.isatty()
+if _ANSI and os.name == "nt":
+    colorama.just_fix_windows_console()
+
+if _ANSI:
+    _SUCCESS_PREFIX = f"{colorama.Fore.GREEN}●{colorama.Fore.RESET} "
+    _FAILED_PREFIX = f"{colorama.Fore.RED}●{colorama.Fore.RESET} "
+    _CLEAR_SCREEN = "\x1b[2J\x1b[H"
+else:
+    _SUCCESS_PREFIX = "[OK] "
+    _FAILED_PREFIX = "[FAIL] "
+    _CLEAR_SCREEN = ""
+
+_FILTER_FLAGS = frozenset(("all", "success", "failed"))
+_PRINTED_FLAGS = {
+    "all": frozenset(("success", "failed", None)),
+    "success": frozenset(("success", None)),
+    "failed": frozenset(("failed", None))
+}
+_BUFFER_LIMIT = 4096
+
 
 class ConsoleManager:
     """
     Manages console output for displaying status messages with colored flags.
 
     This class is responsible for formatting and printing messages to the console. It allows filtering
-    of messages based on their status and keeps a log of messages in memory.
+    of messages based on their status and keeps a log of messages in memory. Printed messages are
+    buffered and written to the stream in batches; call `flush` to write out any pending output.
     """
 
     flags = {
-        "success": f"{colorama.Fore.GREEN}●{colorama.Fore.RESET}",
-        "failed": f"{colorama.Fore.RED}●{colorama.Fore.RESET}",
-        None: ""
+        "success": _SUCCESS_PREFIX,
+        "failed": _FAILED_PREFIX,
+        None: " "
     }
+    filter_flags = _FILTER_FLAGS
 
     def __init__(self, output_level: str = "failed") -> None:
         """
@@ -30,8 +53,11 @@ class ConsoleManager:
         :type output_level: str, optional
         """
         self.messages = []
+        self._messages_by_flag = {"success": [], "failed": []}
         self.stream = sys.stdout
         self.output_level = output_level
+        self._buffer = []
+        self._buffer_size = 0
 
     def print(self, msg: str, flag: str = None) -> None:
         """
@@ -45,16 +71,31 @@ class ConsoleManager:
         :raises ValueError: If an invalid status flag is provided.
         """
         if flag not in self.flags:
-            logger.error(f"Invalid status: '{flag}'. Valid options are 'success' and 'failed'")
+            logger.error("Invalid status: '%s'. Valid options are 'success' and 'failed'", flag)
             raise ValueError(f"Invalid status: '{flag}'. Valid options are 'success' and 'failed'")
 
-        formatted_msg = f"{self.flags[flag]} {msg}\n"
-        self.messages.append((formatted_msg, flag))
+        formatted_msg = self.flags[flag] + msg + "\n"
+        self.messages.append(formatted_msg)
+        if flag:
+            self._messages_by_flag[flag].append(formatted_msg)
 
-        if flag and self.output_level != "all" and self.output_level != flag:
+        if flag not in self._printed_flags:
             return
 
-        self.stream.write(formatted_msg)
+        self._buffer.append(formatted_msg)
+        self._buffer_size += len(formatted_msg)
+        if self._buffer_size > _BUFFER_LIMIT:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes all buffered messages to the console stream.
+        """
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffer_size = 0
+        self.stream.flush()
 
     def filter_by_flag(self, flag: str = "all") -> None:
         """
@@ -68,15 +109,39 @@ class ConsoleManager:
 
         :raises ValueError: If an invalid status flag is provided.
         """
-        if flag not in ("all", "success", "failed"):
-            logger.error(f"Invalid status: '{flag}'. Valid options are 'success', 'failed', 'all'")
+        if flag not in _FILTER_FLAGS:
+            logger.error("Invalid status: '%s'. Valid options are 'success', 'failed', 'all'", flag)
             raise ValueError(f"Invalid status: '{flag}'. Valid options are 'success', 'failed', 'all'")
 
-        os.system('cls||clear')
-        filtered_messages = [msg for msg, msg_flag in self.messages if flag == "all" or flag == msg_flag]
+        self.flush()
+        if _CLEAR_SCREEN:
+            self.stream.write(_CLEAR_SCREEN)
+        filtered_messages = self.messages if flag == "all" else self._messages_by_flag[flag]
 
         if not filtered_messages:
             self.stream.write(f"-- There isn't any {flag} message to show. --\n")
         else:
-            for msg in filtered_messages:
-                self.stream.write(msg)
+            self.stream.write("".join(filtered_messages))
+
+    @property
+    def output_level(self) -> str:
+        """
+        Returns the level of messages to be printed.
+
+        :returns: The output level.
+        :rtype: str
+        """
+        return self._output_level
+
+    @output_level.setter
+    def output_level(self, output_level: str) -> None:
+        """
+        Sets the level of messages to be printed, along with the set of flags it lets through.
+
+        Messages without a flag are always printed; an unknown level lets no flagged message through.
+
+        :param output_level: The output level. Options are "all", "success", and "failed".
+        :type output_level: str
+        """
+        self._output_level = output_level
+        self._printed_flags = _PRINTED_FLAGS.get(output_level, frozenset((None,)))
@@ -1,10 +1,105 @@
 import pathlib
 import logging
-from typing import Generator, Union
+import errno
+import mmap
+import os
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Generator, Iterable, List, Optional, Set, Tuple, Union
+from file_handler.hash_db import HashDB
+
+try:
+    from blake3 import blake3 as _hasher
+    HASH_ALGORITHM = "blake3"
+except ImportError:
+    from hashlib import blake2b as _hasher
+    HASH_ALGORITHM = "blake2b"
 
 
 logger = logging.getLogger(__name__)
 
+_PARTIAL_HASH_SIZE = 4096
+_MMAP_HASH_THRESHOLD = 64 * 1024
+
+
+def _move(source: str, target: str) -> None:
+    """
+    Move a file, replacing any existing file at the target path.
+
+    Within a filesystem this is a single atomic rename. Only when the target is on another filesystem is the
+    file copied and the source removed.
+
+    :param source: The path of the file to move.
+    :type source: str
+    :param target: The path to move the file to.
+    :type target: str
+
+    :raises OSError: If the file cannot be moved.
+    """
+    try:
+        os.replace(source, target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source, target)
+
+
+def _file_digest(file_path: str, size_limit: Optional[int] = None) -> bytes:
+    """
+    Hash the contents of a file with BLAKE3, or with BLAKE2 when the `blake3` package is not installed.
+
+    Files of 64 KiB or more are memory-mapped and handed to the hasher as a single buffer.
+
+    :param file_path: The path of the file to hash.
+    :type file_path: str
+    :param size_limit: If given, only this many bytes from the start of the file are hashed.
+    :type size_limit: int, optional
+
+    :returns: The digest of the hashed contents.
+    :rtype: bytes
+    """
+    hasher = _hasher()
+    with open(file_path, "rb") as file:
+        if size_limit is not None:
+            hasher.update(file.read(size_limit))
+        elif os.fstat(file.fileno()).st_size < _MMAP_HASH_THRESHOLD:
+            hasher.update(file.read())
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                hasher.update(buffer)
+
+    return hasher.digest()
+
+
+def _next_available_name(file_name: str, existing: Set[str]) -> str:
+    """
+    Get a name for a file that does not clash with any of the existing names.
+
+    A clashing name gets a counter one higher than the largest one already in use, e.g. 'file (3).txt'
+    when both 'file.txt' and 'file (2).txt' exist.
+
+    :param file_name: The desired file name.
+    :type file_name: str
+    :param existing: The names already present in the target folder, normalized with `os.path.normcase`.
+    :type existing: Set[str]
+
+    :returns: `file_name` itself if it is free, otherwise a numbered variant of it.
+    :rtype: str
+    """
+    if os.path.normcase(file_name) not in existing:
+        return file_name
+
+    stem, suffix = os.path.splitext(file_name)
+    head, tail = os.path.normcase(f"{stem} ("), os.path.normcase(f"){suffix}")
+    start, end = len(head), -len(tail)
+    counters = (
+        int(counter) for name in existing
+        if name.startswith(head) and name.endswith(tail) and (counter := name[start:end]).isdecimal()
+    )
+
+    return f"{stem} ({max(counters, default=0) + 1}){suffix}"
+
 
 class FileHandler:
     """
@@ -13,30 +108,57 @@ class FileHandler:
     This class provides utility functions for common file operations such as retrieving files, 
     creating folders, and moving files within a specified directory. Hidden files (files whose
     names start with a period '.') are excluded from all operations by default.
+
+    The contents of target folders are read once and then kept up to date in memory as files are
+    moved, so the handler assumes no other process changes those folders while it is in use.
     """
 
-    def __init__(self, folder_path: Union[str, pathlib.Path]) -> None:
+    def __init__(
+            self,
+            folder_path: Union[str, pathlib.Path],
+            hash_db: Optional[HashDB] = None
+    ) -> None:
         """
         Initialize the FileHandler with the specified folder path.
 
         :param folder_path: The path to the root directory to manage.
         :type folder_path: Union[str, pathlib.Path]
+        :param hash_db: The database to look up file hashes from previous runs in, and to store newly computed hashes and moved files in. Defaults to keeping hashes for the lifetime of the handler only.
+        :type hash_db: HashDB, optional
 
         :raises TypeError: If folder_path is not a string or pathlib.Path object.
         :raises NotADirectoryError: If folder_path does not exist or is not a directory.
         """
         self.folder_path = folder_path
+        self._hash_db = hash_db
+        self._digests: Dict[Tuple[str, int, int], List[Optional[bytes]]] = {}
+        self._digest_keys: Dict[str, Tuple[str, int, int]] = {}
 
     def get_files(self) -> Generator[pathlib.Path, None, None]:
         """
         Retrieve all non-hidden files in the root folder.
 
+        On POSIX systems the folder is read in full first and the files are yielded in ascending inode order,
+        which roughly follows their on-disk layout and keeps subsequent metadata access sequential on spinning
+        disks. On Windows, where reading an entry's file ID costs an extra call and says nothing about its
+        layout, the files are yielded in directory order.
+
         :yields: The path of each file in the root folder.
         :rtype: Generator[pathlib.Path, None, None]
         """
-        for content in self._folder_path.iterdir():
-            if content.is_file() and not content.name.startswith("."):
-                yield content
+        with os.scandir(self._folder_path) as entries:
+            if os.name == "nt":
+                files = [entry.path for entry in entries if entry.name[0] != "." and entry.is_file()]
+            else:
+                files = [
+                    path for _, path in sorted(
+                        (entry.inode(), entry.path) for entry in entries
+                        if entry.name[0] != "." and entry.is_file()
+                    )
+                ]
+
+        for path in files:
+            yield pathlib.Path(path)
 
     def create_folder(self, folder_name: Union[str, pathlib.Path]) -> None:
         """
@@ -48,24 +170,37 @@ class FileHandler:
         :raises TypeError: If folder_name is not a string or pathlib.Path object.
         :raises FileExistsError: If a file with the same name as folder_name exists in the directory.
         """
-        if not isinstance(folder_name, (str, pathlib.Path)):
-            raise TypeError("folder_name should be a `str` or `pathlib.Path` object")
+        try:
+            target_path = os.path.join(self._folder_path, os.fspath(folder_name))
+        except TypeError:
+            raise TypeError("folder_name should be a `str` or `pathlib.Path` object") from None
 
-        target_path = self._folder_path / folder_name
-        if target_path.exists() and target_path.is_file():
-            raise FileExistsError(f"A file with the name '{folder_name}' already exists")
+        try:
+            mode = os.stat(target_path).st_mode
+        except FileNotFoundError:
+            os.makedirs(target_path, exist_ok=True)
+            target_path = os.path.normpath(target_path)
+            self._dir_cache[target_path] = set()
+            self._dir_cache.pop(os.path.dirname(target_path), None)
+            return
 
-        target_path.mkdir(parents=True, exist_ok=True)
+        if stat.S_ISREG(mode):
+            raise FileExistsError(f"A file with the name '{folder_name}' already exists")
+        if not stat.S_ISDIR(mode):
+            os.makedirs(target_path, exist_ok=True)
 
     def move_file(
             self,
             file: Union[str, pathlib.Path],
             folder_name: Union[str, pathlib.Path],
             keep_dup: bool = True
-    ) -> None:
+    ) -> bool:
         """
         Move a file to the specified folder.
 
+        If keep_dup is True and a file with the same name and the same contents is already in the folder, the file
+        is left in place instead of being stored twice.
+
         :param file: The file to move. Can be a string or pathlib.Path object.
         :type file: Union[str, pathlib.Path]
         :param folder_name: The target folder name or path. Can be a string or pathlib.Path object.
@@ -73,39 +208,284 @@ class FileHandler:
         :param keep_dup: If True, renames duplicate files to avoid overwriting. If False, overwrites existing files with the same name. Defaults to True.
         :type keep_dup: bool, optional
 
+        :returns: True if the file was moved, False if it was left in place because an identical file is already in folder_name.
+        :rtype: bool
+
         :raises TypeError: If file or folder_name is not a string or pathlib.Path object.
         :raises FileNotFoundError: If file does not exist or is not a file.
         :raises NotADirectoryError: If folder_name does not exist or is not a directory.
         :raises PermissionError: If there are insufficient permissions to move file.
         """
-        if not isinstance(file, (str, pathlib.Path)):
-            raise TypeError("file should be a `str` or `pathlib.Path` object")
-        if not isinstance(folder_name, (str, pathlib.Path)):
-            raise TypeError("folder_name should be a `str` or `pathlib.Path` object")
-
-        file_path = self._folder_path / file
-        target_path = self._folder_path / folder_name
+        try:
+            file_path = os.path.normpath(os.path.join(self._folder_path, os.fspath(file)))
+        except TypeError:
+            raise TypeError("file should be a `str` or `pathlib.Path` object") from None
+        try:
+            target_path = os.path.normpath(os.path.join(self._folder_path, os.fspath(folder_name)))
+        except TypeError:
+            raise TypeError("folder_name should be a `str` or `pathlib.Path` object") from None
 
-        if not file_path.is_file():
-            logger.error(f"Cannot move file: '{file_path}' is invalid or does not exist")
+        if not os.path.isfile(file_path):
+            logger.error("Cannot move file: '%s' is invalid or does not exist", file_path)
             raise FileNotFoundError(f"No such file path: {file_path}")
-        if not target_path.is_dir():
-            logger.error(f"Target folder '{target_path}' is invalid or does not exist")
+        if not os.path.isdir(target_path):
+            logger.error("Target folder '%s' is invalid or does not exist", target_path)
             raise NotADirectoryError(f"No such folder path: {target_path}")
 
-        target_file_path = target_path / file_path.name
+        file_name = os.path.basename(file_path)
+        target_name = file_name
         if keep_dup:
-            counter = 1
-            while target_file_path.exists():
-                target_file_path = target_path / f"{file_path.stem} ({counter}){file_path.suffix}"
-                counter += 1
+            names = self._folder_names(target_path)
+            existing_path = os.path.join(target_path, file_name)
+            if os.path.normcase(file_name) in names and self._is_identical(file_path, existing_path):
+                logger.info("Identical file already exists: '%s'", existing_path)
+                return False
+            target_name = self._free_name(target_path, file_name, names)
+        target_file_path = os.path.join(target_path, target_name)
 
         try:
-            file_path.rename(target_file_path)
+            _move(file_path, target_file_path)
         except PermissionError as e:
-            logger.error(f"Permission error when moving '{file_path.name}': '{e}'")
+            logger.error("Permission error when moving '%s': '%s'", file_name, e)
             raise
 
+        self._record_move(file_path, target_file_path)
+        return True
+
+    def move_files_parallel(
+            self,
+            plan: Iterable[Tuple[str, str]],
+            keep_dup: bool = True,
+            max_workers: int = 8
+    ) -> Generator[Tuple[str, str, bool, Optional[OSError]], None, None]:
+        """
+        Move many files within the root folder, running the renames concurrently.
+
+        Unlike `move_file`, the arguments are not validated for each file. `plan` holds plain file and folder
+        names relative to the root folder, such as those of the files from `get_files`, and the target folders
+        must already exist. The target names are all resolved up front, reading each target folder only once,
+        and the renames are then spread over a pool of threads, so that slow renames (e.g. on network storage)
+        overlap. Results are yielded in the order the moves complete.
+
+        :param plan: The `(file_name, folder_name)` pairs to move.
+        :type plan: Iterable[Tuple[str, str]]
+        :param keep_dup: If True, renames duplicate files to avoid overwriting. If False, overwrites existing files with the same name. Defaults to True.
+        :type keep_dup: bool, optional
+        :param max_workers: The maximum number of threads performing renames. Defaults to 8.
+        :type max_workers: int, optional
+
+        :yields: A `(file_name, folder_name, moved, error)` tuple for each planned move, where `moved` is True if the file was moved and `error` is the raised error if it could not be. If neither is set, the file was left in place because an identical file is already in the folder.
+        :rtype: Generator[Tuple[str, str, bool, Optional[OSError]], None, None]
+        """
+        moves = []
+        for file_name, folder_name, source, target, error in self._plan_moves(plan, keep_dup):
+            if error is None and target is not None:
+                moves.append((file_name, folder_name, source, target))
+            else:
+                yield file_name, folder_name, False, error
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_move, source, target): (file_name, folder_name, source, target)
+                for file_name, folder_name, source, target in moves
+            }
+
+            for future in as_completed(futures):
+                file_name, folder_name, source, target = futures[future]
+                error = future.exception()
+                if error is None:
+                    self._record_move(source, target)
+                else:
+                    logger.error("Cannot move '%s' to '%s': '%s'", source, target, error)
+                    self._dir_cache.pop(os.path.dirname(target), None)
+
+                yield file_name, folder_name, error is None, error
+
+    def _plan_moves(
+            self,
+            plan: Iterable[Tuple[str, str]],
+            keep_dup: bool
+    ) -> Generator[Tuple[str, str, str, Optional[str], Optional[OSError]], None, None]:
+        """
+        Resolve the source and target paths of planned moves.
+
+        Every resolved target name is recorded in the cached contents of its folder right away, so later moves
+        into the same folder never pick a name that is already taken, even before the earlier moves have been
+        performed. Such reserved names are not on disk yet, so files are never compared against them.
+
+        :param plan: The `(file_name, folder_name)` pairs to move.
+        :type plan: Iterable[Tuple[str, str]]
+        :param keep_dup: If True, clashing target names get a counter appended.
+        :type keep_dup: bool
+
+        :yields: A `(file_name, folder_name, source, target, error)` tuple for each planned move, where `target` is None if keep_dup is True and an identical file is already in the target folder, and `error` is the error raised while reading the target folder, if any.
+        :rtype: Generator[Tuple[str, str, str, Optional[str], Optional[OSError]], None, None]
+        """
+        base = self._folder_path + os.sep
+        targets: Dict[str, Tuple[str, Set[str], Set[str]]] = {}
+
+        for file_name, folder_name in plan:
+            target = targets.get(folder_name)
+            if target is None:
+                target_path = os.path.normpath(base + folder_name)
+                try:
+                    target = targets[folder_name] = (target_path, self._folder_names(target_path), set())
+                except OSError as e:
+                    logger.error("Cannot read target folder '%s': '%s'", target_path, e)
+                    yield file_name, folder_name, base + file_name, target_path, e
+                    continue
+
+            target_path, names, reserved = target
+            source = base + file_name
+            target_name = file_name
+            if keep_dup:
+                existing_path = target_path + os.sep + file_name
+                key = os.path.normcase(file_name)
+                if key in names and key not in reserved and self._is_identical(source, existing_path):
+                    logger.info("Identical file already exists: '%s'", existing_path)
+                    yield file_name, folder_name, source, None, None
+                    continue
+                target_name = self._free_name(target_path, file_name, names)
+
+            names.add(os.path.normcase(target_name))
+            reserved.add(os.path.normcase(target_name))
+            yield file_name, folder_name, source, target_path + os.sep + target_name, None
+
+    def _is_identical(self, source: str, target: str) -> bool:
+        """
+        Check whether two files have the same contents.
+
+        The files are compared by size, then by a hash of their first 4 KiB, and only then by a hash of their
+        full contents, so that they are read no further than needed. Hashes are cached for the lifetime of the
+        handler, keyed by path, size and modification time.
+
+        :param source: The path of the first file.
+        :type source: str
+        :param target: The path of the second file.
+        :type target: str
+
+        :returns: True if both files have the same contents, False otherwise or if either cannot be read.
+        :rtype: bool
+        """
+        try:
+            source_stat, target_stat = os.stat(source), os.stat(target)
+            if source_stat.st_size != target_stat.st_size:
+                return False
+
+            source_key = (source, source_stat.st_size, source_stat.st_mtime_ns)
+            target_key = (target, target_stat.st_size, target_stat.st_mtime_ns)
+            if self._digest(source_key, partial=True) != self._digest(target_key, partial=True):
+                return False
+            if source_stat.st_size <= _PARTIAL_HASH_SIZE:
+                return True
+
+            return self._digest(source_key, partial=False) == self._digest(target_key, partial=False)
+        except OSError as e:
+            logger.warning("Cannot compare '%s' with '%s': '%s'", source, target, e)
+            return False
+
+    def _digest(self, key: Tuple[str, int, int], partial: bool) -> bytes:
+        """
+        Get the cached hash of a file, looking it up in the hash database or computing it on first use.
+
+        :param key: The path, size and modification time of the file.
+        :type key: Tuple[str, int, int]
+        :param partial: If True, only the first 4 KiB of the file are hashed.
+        :type partial: bool
+
+        :returns: The digest of the file.
+        :rtype: bytes
+
+        :raises OSError: If the file cannot be read.
+        """
+        digests = self._digests.get(key)
+        if digests is None:
+            saved = None if self._hash_db is None else self._hash_db.get(key)
+            digests = self._digests[key] = [None, None] if saved is None else list(saved)
+            self._digest_keys[key[0]] = key
+
+        index = 0 if partial else 1
+        if digests[index] is None:
+            digests[index] = _file_digest(key[0], _PARTIAL_HASH_SIZE if partial else None)
+            if self._hash_db is not None and digests[0] is not None:
+                self._hash_db.put(key, *digests)
+
+        return digests[index]
+
+    def _free_name(self, folder_path: str, file_name: str, names: Set[str]) -> str:
+        """
+        Get a name for a file that is free both in the cached contents of a folder and on disk.
+
+        The cached names only fold case where `os.path.normcase` does, so on case-insensitive filesystems that
+        it treats as case-sensitive (e.g. on macOS) a free-looking name may still match an existing entry. Each
+        candidate is therefore checked on disk as well, and taken names are added to the cache.
+
+        :param folder_path: The normalized absolute path of the folder.
+        :type folder_path: str
+        :param file_name: The desired file name.
+        :type file_name: str
+        :param names: The cached names of the entries in the folder.
+        :type names: Set[str]
+
+        :returns: `file_name` itself if it is free, otherwise a numbered variant of it.
+        :rtype: str
+        """
+        target_name = _next_available_name(file_name, names)
+        while os.path.lexists(os.path.join(folder_path, target_name)):
+            names.add(os.path.normcase(target_name))
+            target_name = _next_available_name(file_name, names)
+
+        return target_name
+
+    def _folder_names(self, folder_path: str) -> Set[str]:
+        """
+        Get the names of the entries in a folder, reading the folder only the first time it is requested.
+
+        :param folder_path: The normalized absolute path of the folder.
+        :type folder_path: str
+
+        :returns: The cached set of entry names normalized with `os.path.normcase`, which callers update as they move files.
+        :rtype: Set[str]
+
+        :raises OSError: If the folder cannot be read.
+        """
+        names = self._dir_cache.get(folder_path)
+        if names is None:
+            with os.scandir(folder_path) as entries:
+                names = self._dir_cache[folder_path] = {os.path.normcase(entry.name) for entry in entries}
+
+        return names
+
+    def _record_move(self, source: str, target: str) -> None:
+        """
+        Update the cached folder contents after a file has been moved, and move its cached hashes to the new path.
+
+        :param source: The normalized absolute path the file was moved from.
+        :type source: str
+        :param target: The normalized absolute path the file was moved to.
+        :type target: str
+        """
+        source_folder, source_name = os.path.split(source)
+        names = self._dir_cache.get(source_folder)
+        if names is not None:
+            names.discard(os.path.normcase(source_name))
+
+        target_folder, target_name = os.path.split(target)
+        names = self._dir_cache.get(target_folder)
+        if names is not None:
+            names.add(os.path.normcase(target_name))
+
+        if self._hash_db is not None:
+            self._hash_db.discard(source)
+
+        key = self._digest_keys.pop(source, None)
+        digests = None if key is None else self._digests.pop(key, None)
+        if digests is not None:
+            key = self._digest_keys[target] = (target, key[1], key[2])
+            self._digests[key] = digests
+            if self._hash_db is not None and digests[0] is not None:
+                self._hash_db.put(key, *digests)
+
     @property
     def folder_path(self) -> str:
         """
@@ -114,7 +494,7 @@ class FileHandler:
         :returns: The absolute path of the root folder as a string.
         :rtype: str
         """
-        return str(self._folder_path)
+        return self._folder_path
 
     @folder_path.setter
     def folder_path(self, folder_path: Union[str, pathlib.Path]) -> None:
@@ -127,12 +507,19 @@ class FileHandler:
         :raises TypeError: If folder_path is not a string or pathlib.Path object.
         :raises NotADirectoryError: If folder_path does not exist or is not a directory.
         """
-        if not isinstance(folder_path, (str, pathlib.Path)):
-            raise TypeError("folder_path should be a `str` or `pathlib.Path` object")
+        try:
+            folder_path = pathlib.Path(folder_path)
+        except TypeError:
+            raise TypeError("folder_path should be a `str` or `pathlib.Path` object") from None
+
+        try:
+            is_dir = stat.S_ISDIR(os.stat(folder_path).st_mode)
+        except (FileNotFoundError, NotADirectoryError):
+            is_dir = False
 
-        folder_path = pathlib.Path(folder_path)
-        if folder_path.is_dir():
-            self._folder_path = folder_path.resolve()
+        if is_dir:
+            self._folder_path = os.path.realpath(folder_path)
+            self._dir_cache: Dict[str, Set[str]] = {}
         else:
-            logger.error(f"Invalid folder path provided: {folder_path}")
+            logger.error("Invalid folder path provided: %s", folder_path)
             raise NotADirectoryError(f"No such folder path: {folder_path}")
@@ -0,0 +1,153 @@
+import logging
+import pathlib
+import sqlite3
+from typing import Dict, Optional, Set, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_VERSION = 1
+
+
+class HashDB:
+    """
+    Persists file hashes across runs in an SQLite database.
+
+    Hashes are keyed by `(path, size, mtime_ns)`, so a file that has changed since it was hashed is never
+    matched. Each row records the hash algorithm it was computed with, and rows from another algorithm are
+    ignored. The database is only opened on first use, and saving writes nothing but the hashes stored and the
+    paths discarded since it was opened.
+
+    The database is never required: if it cannot be opened, read or written, a warning is logged and the
+    hashes are only kept for the current run.
+    """
+
+    def __init__(self, db_path: Union[str, pathlib.Path], algorithm: str) -> None:
+        """
+        Initialize the HashDB with the path of its database file.
+
+        :param db_path: The path of the SQLite database file. It is created, along with its folder, when the first hashes are saved.
+        :type db_path: Union[str, pathlib.Path]
+        :param algorithm: The name of the hash algorithm the stored hashes are computed with.
+        :type algorithm: str
+        """
+        self._db_path = pathlib.Path(db_path)
+        self._algorithm = algorithm
+        self._db: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._stored: Dict[str, Tuple[int, int, bytes, Optional[bytes]]] = {}
+        self._discarded: Set[str] = set()
+
+    def get(self, key: Tuple[str, int, int]) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        """
+        Get the saved hashes of a file.
+
+        :param key: The path, size and modification time of the file.
+        :type key: Tuple[str, int, int]
+
+        :returns: The `(partial, full)` digests, or None if none were saved for the file in its current state with the current algorithm.
+        :rtype: Tuple[bytes, Optional[bytes]], optional
+        """
+        if not (self._opened or self._db_path.is_file()) or not self._connect():
+            return None
+
+        try:
+            return self._db.execute(
+                "SELECT partial_hash, hash FROM hashes WHERE path = ? AND size = ? AND mtime = ? AND algorithm = ?",
+                (*key, self._algorithm)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Cannot read the hash database '%s': %s", self._db_path, e)
+            return None
+
+    def put(self, key: Tuple[str, int, int], partial: bytes, full: Optional[bytes] = None) -> None:
+        """
+        Store the hashes of a file, to be written by `save`.
+
+        :param key: The path, size and modification time of the file.
+        :type key: Tuple[str, int, int]
+        :param partial: The digest of the first 4 KiB of the file.
+        :type partial: bytes
+        :param full: The digest of the full file, if it has been computed.
+        :type full: bytes, optional
+        """
+        path, size, mtime = key
+        self._discarded.discard(path)
+        self._stored[path] = (size, mtime, partial, full)
+
+    def discard(self, path: str) -> None:
+        """
+        Forget the hashes of a path, e.g. after the file at it has been moved away. The row is deleted by `save`.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+        self._stored.pop(path, None)
+        self._discarded.add(path)
+
+    def save(self) -> None:
+        """
+        Write the stored hashes and delete the rows of discarded paths, then close the database.
+        """
+        if not self._stored and not (self._discarded and self._db_path.is_file()):
+            self.close()
+            return
+
+        if self._connect():
+            try:
+                with self._db:
+                    self._db.executemany("DELETE FROM hashes WHERE path = ?", ((path,) for path in self._discarded))
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            (path, size, mtime, self._algorithm, partial, full)
+                            for path, (size, mtime, partial, full) in self._stored.items()
+                        )
+                    )
+            except sqlite3.Error as e:
+                logger.warning("Cannot save the hash database '%s': %s", self._db_path, e)
+
+        self._stored.clear()
+        self._discarded.clear()
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database, discarding anything not saved yet. It is opened again on next use.
+        """
+        if self._db is not None:
+            self._db.close()
+        self._db = None
+        self._opened = False
+
+    def _connect(self) -> bool:
+        """
+        Open the database and create its table, if that has not been attempted yet.
+
+        A database in an older layout is dropped and created again.
+
+        :returns: True if the database is open, False if it cannot be opened.
+        :rtype: bool
+        """
+        if self._opened:
+            return self._db is not None
+
+        self._opened = True
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Files are hashed on the organizing thread, while the database is saved on the main one
+            self._db = sqlite3.connect(self._db_path, check_same_thread=False)
+            with self._db:
+                if self._db.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                    self._db.execute("DROP TABLE IF EXISTS hashes")
+                    self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS hashes "
+                    "(path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, algorithm TEXT, partial_hash BLOB, hash BLOB)"
+                )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Cannot open the hash database '%s': %s", self._db_path, e)
+            self.close()
+            self._opened = True
+
+        return self._db is not None
@@ -1,18 +1,24 @@
-import tkinter as tk
 import argparse
 import pathlib
 import logging
-from tkinter import filedialog
-from typing import List
+import sys
+from functools import lru_cache
+from typing import Generator, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+MAX_FOLDERS = 20
 
+
+@lru_cache(maxsize=None)
 def parse_args() -> argparse.Namespace:
     """
     Parse command-line arguments.
 
+    The arguments are only parsed on the first call; later calls return the same namespace. Call
+    `parse_args.cache_clear()` to parse them again (e.g. in tests).
+
     :returns: Parsed command-line arguments as an argparse.Namespace object.
     :rtype: argparse.Namespace
     """
@@ -22,6 +28,7 @@ def parse_args() -> argparse.Namespace:
         "-e",
         "--ext",
         nargs="+",
+        type=_extension_mapping,
         help=(
             "Specify associated extension for folder in the format '.ext1 folder1' '.ext2 folder2'..."
         )
@@ -54,36 +61,151 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def get_folders() -> List[str]:
+def _extension_mapping(value: str) -> Tuple[str, str]:
+    """
+    Parse an '.ext folder' command-line value into an extension-folder pair.
+
+    :param value: The command-line value.
+    :type value: str
+
+    :returns: The interned extension and folder.
+    :rtype: Tuple[str, str]
+
+    :raises argparse.ArgumentTypeError: If the value is not in the '.ext folder' format.
+    """
+    extension, _, folder = value.strip().partition(" ")
+    folder = folder.strip()
+    if not (extension.startswith(".") and folder):
+        raise argparse.ArgumentTypeError(f"invalid mapping '{value}', expected the format '.ext folder'")
+
+    return sys.intern(extension), sys.intern(folder)
+
+
+def iter_folders() -> Generator[str, None, None]:
     """
-    Get a list of folders selected by the user via file dialog. The user can select up to 20 folders.
+    Yield the folders selected by the user via file dialog, each one as soon as it is selected. The user can
+    select up to 20 folders.
 
-    :returns: A list of selected folder paths.
-    :rtype: List[str]
+    The native folder dialog is used on Windows (with pywin32) and macOS (with pyobjc); otherwise, or if those
+    packages are not installed, the Tk dialog is used.
+
+    :yields: The path of each selected folder.
+    :rtype: Generator[str, None, None]
 
     :raises ValueError: If no folder is selected by the user.
     """
+    if sys.platform == "win32":
+        select_folders = _select_folders_windows
+    elif sys.platform == "darwin":
+        select_folders = _select_folders_macos
+    else:
+        select_folders = _select_folders_tk
+
+    selected = False
+    try:
+        for folder_path in select_folders():
+            selected = True
+            yield folder_path
+    except ImportError:
+        for folder_path in _select_folders_tk():
+            selected = True
+            yield folder_path
+
+    if not selected:
+        logger.error("There is no selected folder to organize")
+        raise ValueError("There is no selected folder to organize")
+
+
+def _select_folders_tk() -> Generator[str, None, None]:
+    """
+    Let the user select folders one at a time with the Tk folder dialog, until the dialog is cancelled.
+
+    :yields: Each newly selected folder path.
+    :rtype: Generator[str, None, None]
+    """
+    import tkinter as tk
+    from tkinter import filedialog
+
     tk_root = tk.Tk()
     tk_root.withdraw()
 
     folder_paths = []
     last_directory = pathlib.Path.home()
 
-    while len(folder_paths) < 20:
-        folder_path = filedialog.askdirectory(title="Select a folder", initialdir=last_directory)
+    # The generator may be closed before the user is done, e.g. when organizing a folder fails
+    try:
+        while len(folder_paths) < MAX_FOLDERS:
+            folder_path = filedialog.askdirectory(title="Select a folder", initialdir=last_directory)
+
+            if not folder_path:
+                break
+            if folder_path in folder_paths:
+                continue
 
-        if not folder_path:
+            folder_paths.append(folder_path)
+            last_directory = pathlib.Path(folder_path).parent
+            yield folder_path
+    finally:
+        tk_root.destroy()
+
+
+def _select_folders_windows() -> Generator[str, None, None]:
+    """
+    Let the user select folders one at a time with the native Windows folder dialog, until it is cancelled.
+
+    :yields: Each newly selected folder path.
+    :rtype: Generator[str, None, None]
+
+    :raises ImportError: If pywin32 is not installed.
+    """
+    import win32gui
+    from win32com.shell import shell, shellcon
+
+    def start_in(hwnd: int, msg: int, lparam: int, directory: str) -> None:
+        # Preselect the start directory once the dialog is shown, as `initialdir` does for the Tk dialog
+        if msg == shellcon.BFFM_INITIALIZED:
+            win32gui.SendMessage(hwnd, shellcon.BFFM_SETSELECTIONW, 1, directory)
+
+    folder_paths = []
+    last_directory = pathlib.Path.home()
+    flags = shellcon.BIF_NEWDIALOGSTYLE | shellcon.BIF_RETURNONLYFSDIRS
+
+    while len(folder_paths) < MAX_FOLDERS:
+        selection = shell.SHBrowseForFolder(0, None, "Select a folder", flags, start_in, str(last_directory))
+        pidl = (selection or (None,))[0]
+        if not pidl:
             break
+
+        folder_path = shell.SHGetPathFromIDListW(pidl)
         if folder_path in folder_paths:
             continue
 
         folder_paths.append(folder_path)
         last_directory = pathlib.Path(folder_path).parent
+        yield folder_path
 
-    tk_root.destroy()
 
-    if not folder_paths:
-        logger.error("There is no selected folder to organize")
-        raise ValueError("There is no selected folder to organize")
+def _select_folders_macos() -> Generator[str, None, None]:
+    """
+    Let the user select folders with the native macOS open panel, which supports selecting several at once.
+
+    :yields: Each selected folder path.
+    :rtype: Generator[str, None, None]
+
+    :raises ImportError: If pyobjc is not installed.
+    """
+    import AppKit
+
+    AppKit.NSApplication.sharedApplication()
+    panel = AppKit.NSOpenPanel.openPanel()
+    panel.setCanChooseFiles_(False)
+    panel.setCanChooseDirectories_(True)
+    panel.setAllowsMultipleSelection_(True)
+    panel.setMessage_(f"Select up to {MAX_FOLDERS} folders")
+    panel.setDirectoryURL_(AppKit.NSURL.fileURLWithPath_(str(pathlib.Path.home())))
+
+    if panel.runModal() != AppKit.NSModalResponseOK:
+        return
 
-    return folder_paths
+    folder_paths = list(dict.fromkeys(str(url.path()) for url in panel.URLs()))
+    yield from folder_paths[:MAX_FOLDERS]
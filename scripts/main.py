@@ -1,37 +1,108 @@
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import IO, Dict, Iterable, List
 from console_manager.console_manager import ConsoleManager
-from file_handler.file_handler import FileHandler
-from scripts.args import parse_args, get_folders
+from file_handler.file_handler import FileHandler, HASH_ALGORITHM
+from file_handler.hash_db import HashDB
+from scripts.args import parse_args, iter_folders
 from config.config import Config
 
+try:
+    # Enables line editing and history for the input() prompts
+    import readline  # noqa: F401
+except ImportError:
+    pass
 
-def organize_files() -> None:
+
+HASH_DB_PATH = Path.home() / ".cache" / "file-organizer" / "hashdb"
+
+_FILTER_PROMPT = "Filter messages by status ('success', 'failed', 'all', 'cancel'): "
+
+
+def organize_folder(handler: FileHandler, folder_path: str, extension_to_folder: Dict[str, str]) -> None:
     """
-    Organize files in specified folders based on their extensions.
+    Organize files in a folder based on their extensions.
+
+    :param handler: The file handler to organize the folder with.
+    :type handler: FileHandler
+    :param folder_path: The path of the folder to organize.
+    :type folder_path: str
+    :param extension_to_folder: The mapping of file extensions to target folders.
+    :type extension_to_folder: Dict[str, str]
     """
-    handler = FileHandler(folder_path=Path(""))
+    handler.folder_path = Path(folder_path)
 
-    for folder_path in configs["folder_paths"]:
-        handler.folder_path = Path(folder_path)
+    console.print(f"--- Starting file organization for '{folder_path}' ---")
+    logger.info("Starting file organization for '%s'", folder_path)
 
-        console.print(f"--- Starting file organization for '{folder_path}' ---")
-        logger.info(f"Starting file organization for '{folder_path}'")
+    plan = []
+    created_folders = set()
+    for file in handler.get_files():
+        target_folder = extension_to_folder.get(file.suffix, "OTHERS")
 
-        for file in handler.get_files():
-            target_folder = configs["extension_to_folder"].get(file.suffix, "OTHERS")
-
-            try:
+        try:
+            if target_folder not in created_folders:
                 handler.create_folder(folder_name=target_folder)
-                handler.move_file(file=file, folder_name=target_folder, keep_dup=configs["keep_duplicates"])
-                console.print(msg=f"'{file.name}' moved to '{target_folder}' folder", flag="success")
+                created_folders.add(target_folder)
+            plan.append((file.name, target_folder))
+
+        except (TypeError, FileExistsError, FileNotFoundError, NotADirectoryError, PermissionError) as e:
+            console.print(msg=f"Failed to move '{file.name}' to '{target_folder}' folder", flag="failed")
+            logger.warning("Error processing '%s': %s", file.name, e)
+
+    moves = handler.move_files_parallel(plan, keep_dup=configs["keep_duplicates"], max_workers=8)
+    for file_name, target_folder, moved, error in moves:
+        if moved:
+            console.print(msg=f"'{file_name}' moved to '{target_folder}' folder", flag="success")
+        elif error is None:
+            console.print(
+                msg=f"'{file_name}' skipped, an identical file is already in '{target_folder}' folder", flag="success"
+            )
+        else:
+            console.print(msg=f"Failed to move '{file_name}' to '{target_folder}' folder", flag="failed")
+            logger.warning("Error processing '%s': %s", file_name, error)
+
+    console.print(f"--- File organization completed successfully for '{folder_path}' ---")
+    console.flush()
+    logger.info("File organization completed successfully for '%s'", folder_path)
+
+
+def organize_files(folder_paths: Iterable[str]) -> List[str]:
+    """
+    Organize files in the given folders based on their extensions.
+
+    Each folder is organized on a background thread as soon as it is received, so organizing a folder overlaps
+    with waiting for the next one (e.g. while the user is still selecting folders). Folders are still organized
+    one at a time, in the order they are received.
+
+    :param folder_paths: The paths of the folders to organize.
+    :type folder_paths: Iterable[str]
+
+    :return: The paths of all received folders.
+    :rtype: List[str]
+    """
+    # Hashes are only ever computed to leave duplicates in place
+    hash_db = HashDB(HASH_DB_PATH, HASH_ALGORITHM) if configs["keep_duplicates"] else None
+    handler = FileHandler(folder_path=Path(""), hash_db=hash_db)
+    extension_to_folder = {sys.intern(ext): sys.intern(folder) for ext, folder in configs["extension_to_folder"].items()}
+
+    received_paths = []
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            futures = []
+            for folder_path in folder_paths:
+                futures.append(executor.submit(organize_folder, handler, folder_path, extension_to_folder))
+                received_paths.append(folder_path)
 
-            except (TypeError, FileExistsError, FileNotFoundError, NotADirectoryError, PermissionError) as e:
-                console.print(msg=f"Failed to move '{file.name}' to '{target_folder}' folder", flag="failed")
-                logger.warning(f"Error processing '{file.name}': {e}")
+            for future in futures:
+                future.result()
+    finally:
+        if hash_db is not None:
+            hash_db.save()
 
-        console.print(f"--- File organization completed successfully for '{folder_path}' ---")
-        logger.info(f"File organization completed successfully for '{folder_path}'")
+    return received_paths
 
 
 def filter_messages(max_cycle: int = 5, max_retry: int = 3) -> None:
@@ -53,17 +124,56 @@ def filter_messages(max_cycle: int = 5, max_retry: int = 3) -> None:
 
     while max_cycle:
         max_cycle -= 1
-        flag = input("Filter messages by status ('success', 'failed', 'all', 'cancel'): ").lower()
+        flag = input(_FILTER_PROMPT).lower()
 
         if flag == "cancel" or not max_retry:
             break
 
-        try:
+        if flag in ConsoleManager.filter_flags:
             console.filter_by_flag(flag)
-        except ValueError:
+        else:
             max_retry -= 1
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """
+    A logging file handler that writes through a 64 KiB buffer.
+
+    Records below WARNING stay in the buffer until it fills up or the handler is flushed or closed, which the
+    logging module does at exit. WARNING and more severe records are flushed right away.
+    """
+
+    buffer_size = 65536
+
+    def _open(self) -> IO[str]:
+        """
+        Open the log file with a `buffer_size` write buffer.
+
+        :return: The opened log file.
+        :rtype: IO[str]
+        """
+        # FileHandler only has an `errors` attribute as of Python 3.9
+        errors = getattr(self, "errors", None)
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding, errors=errors)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write a record to the buffered log file, flushing it right away if the record is a WARNING or more severe.
+
+        :param record: The record to write.
+        :type record: logging.LogRecord
+        """
+        if self.stream is None:
+            self.stream = self._open()
+
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
 def create_logger() -> logging.Logger:
     """
     Create a logger instance for logging information and errors.
@@ -72,7 +182,7 @@ def create_logger() -> logging.Logger:
     :rtype: logging.Logger
     """
     logging.basicConfig(
-        filename="file_organizer.log",
+        handlers=[BufferedFileHandler("file_organizer.log")],
         level=logging.WARNING,
         format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
@@ -88,17 +198,17 @@ if __name__ == "__main__":
         args = parse_args()
         config = Config()
         config.set_configs(
-            folder_paths=get_folders(),
-            extension_to_folder=args.ext,
+            extension_to_folder=dict(args.ext) if args.ext else None,
             keep_duplicates=args.dup,
-            status_level=args.status
+            status_level=args.status,
+            write=False
         )
         configs = config.configs
         console = ConsoleManager(output_level=configs["status_level"])
 
-        organize_files()
+        config.set_configs(folder_paths=organize_files(iter_folders()))
         filter_messages()
 
     except Exception as e:
-        logger.exception(f"An unexpected error occurred: {e}")
+        logger.exception("An unexpected error occurred: %s", e)
         raise